@@ -1,7 +1,9 @@
 
 from .csgstep import (
-    load_step, sphere, cube, wedge, cylinder, cone,
+    load_step, load_step_async, set_executor, set_backend, measure_many,
+    set_memory_mode, memory_report,
+    sphere, cube, wedge, cylinder, cone,
     circle, ellipse, square, polygon,
-    Solid)
+    Topology, Solid)
 
 
@@ -1,8 +1,21 @@
 
 __version__ = '0.0.5'
 
+import os
+import sys
+import asyncio
+import functools
+import tempfile
+import threading
+import weakref
+import concurrent.futures
 import numpy as np
 
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
 # https://dev.opencascade.org/doc/refman/html/package_gp.html
 from OCC.Core.gp import (
      gp_Pnt, gp_Vec, gp_Dir, gp_Ax1, gp_Ax2, gp_Pln,
@@ -28,8 +41,30 @@ from OCC.Core.BRepBuilderAPI import (
      BRepBuilderAPI_MakeEdge, BRepBuilderAPI_MakeWire)
 
 # inspection
-from OCC.Core.TopExp import TopExp_Explorer
-from OCC.Core.TopAbs import TopAbs_EDGE, TopAbs_FACE
+from OCC.Core.TopExp import TopExp_Explorer, topexp
+from OCC.Core.TopAbs import TopAbs_EDGE, TopAbs_FACE, TopAbs_SOLID, TopAbs_VERTEX
+from OCC.Core.TopTools import TopTools_IndexedMapOfShape
+
+# mass properties and bounding boxes
+# https://dev.opencascade.org/doc/refman/html/package_brepgprop.html
+# https://dev.opencascade.org/doc/refman/html/package_brepbndlib.html
+from OCC.Core.GProp import GProp_GProps
+from OCC.Core.BRepGProp import brepgprop
+from OCC.Core.Bnd import Bnd_Box
+from OCC.Core.BRepBndLib import brepbndlib
+
+# point classification and distance
+# https://dev.opencascade.org/doc/refman/html/package_brepclass3d.html
+# https://dev.opencascade.org/doc/refman/html/package_brepextrema.html
+from OCC.Core.BRepClass3d import BRepClass3d_SolidClassifier
+from OCC.Core.BRepExtrema import BRepExtrema_DistShapeShape
+from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_MakeVertex
+from OCC.Core.TopAbs import TopAbs_IN, TopAbs_ON
+
+# tessellation
+from OCC.Core.TopLoc import TopLoc_Location
+from OCC.Core.TopAbs import TopAbs_REVERSED
+from OCC.Core.BRepTools import breptools
 
 # make pipe, fillet, chamfer, and draft angle
 # https://dev.opencascade.org/doc/refman/html/package_brepfilletapi.html
@@ -39,12 +74,14 @@ from OCC.Core.BRepFilletAPI import (
 from OCC.Core.BRepOffsetAPI import BRepOffsetAPI_MakePipe
 
 # draft angle
-from OCC.Core.BOPTools import BOPTools_AlgoTools3D
 from OCC.Core.BRep import BRep_Tool
-from OCC.Core.GeomAdaptor import GeomAdaptor_Surface
-from OCC.Core.GeomAbs import GeomAbs_Plane
 from OCC.Core.BRepOffsetAPI import BRepOffsetAPI_DraftAngle
 
+# topology index
+# https://dev.opencascade.org/doc/refman/html/package_brepadaptor.html
+from OCC.Core.BRepAdaptor import BRepAdaptor_Surface, BRepAdaptor_Curve
+from OCC.Core.GeomAbs import GeomAbs_Plane, GeomAbs_Line
+
 # splines
 # https://dev.opencascade.org/doc/refman/html/package_geomapi.html
 # https://dev.opencascade.org/doc/refman/html/package_tcolgp.html
@@ -66,14 +103,272 @@ from OCC.Core.IFSelect import IFSelect_RetDone
 
 # compound shape
 from OCC.Core.BRep import BRep_Builder
-from OCC.Core.TopoDS import TopoDS_Compound
+from OCC.Core.TopoDS import TopoDS_Compound, topods
 
 TAU = 2 * np.pi
 UX  = (1.,0.,0.)
 UY  = (0.,1.,0.)
 UZ  = (0.,0.,1.)
 
-
+# executor used by the async API
+_executor = None
+_owns_executor = False
+_max_concurrency = None
+_limiters = weakref.WeakKeyDictionary()
+_executor_lock = threading.Lock()
+
+
+def _make_executor(kind, max_workers=None):
+    if isinstance(kind, concurrent.futures.Executor):
+        return kind
+    if kind == 'thread':
+        return concurrent.futures.ThreadPoolExecutor(max_workers)
+    if kind == 'process':
+        return concurrent.futures.ProcessPoolExecutor(max_workers)
+    raise ValueError(f'Unknown executor {kind!r}.')
+
+
+def set_executor(executor='thread', max_workers=None, max_concurrency=None):
+    """Configure the executor used by the async methods.
+    OpenCASCADE calls block, so the async methods run them on this executor
+    instead of the event loop.  pythonOCC holds the GIL for the whole of
+    each OpenCASCADE call, so on a thread executor a long operation still
+    stalls the event loop and its timeout only fires once it returns.
+    Use a process executor where operations may run away, it keeps the
+    event loop free at the cost of pickling shapes.
+    :param executor 'thread', 'process' or a concurrent.futures.Executor object, or None to restore the default thread executor, an executor object is never shut down by csgstep
+    :param max_workers the number of workers when creating a thread or process executor
+    :param max_concurrency the maximum number of operations running or queued on the executor, defaults to the number of CPUs
+    """
+    global _executor, _owns_executor, _max_concurrency
+    with _executor_lock:
+        old, owned = _executor, _owns_executor
+        _executor = None if executor is None else _make_executor(executor, max_workers)
+        # executors passed in belong to the caller, who shuts them down
+        _owns_executor = not isinstance(executor, concurrent.futures.Executor)
+        _max_concurrency = max_concurrency
+        _limiters.clear()
+    if owned and old is not None and old is not _executor:
+        old.shutdown(wait=False)
+
+
+def _get_executor():
+    global _executor, _owns_executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = _make_executor('thread')
+            _owns_executor = True
+        return _executor
+
+
+def _get_limiter(loop):
+    with _executor_lock:
+        limiter = _limiters.get(loop)
+        if limiter is None:
+            limiter = asyncio.Semaphore(_max_concurrency or os.cpu_count() or 1)
+            _limiters[loop] = limiter
+        return limiter
+
+
+# geometry backend used by the boolean methods
+_backend = 'occ'
+_preview_tolerance = None
+
+
+def set_backend(backend, tolerance=None):
+    """Select the backend used by the boolean methods.
+    The 'occ' backend runs the exact openCASCADE booleans.  The 'mesh'
+    backend tessellates the operands and runs approximate booleans on
+    the triangle meshes for fast previews.  The resulting mesh solids
+    can be transformed, combined, queried and written to STL, while
+    fillet, chamfer and draft leave them unchanged.  Switch back to
+    'occ' and rebuild to get solids that can be written to STEP.
+    :param backend 'occ' or 'mesh'
+    :param tolerance the size of the mesh detail, defaults to 1/100 of the size of the smallest operand
+    :return the name of the previous backend
+    """
+    global _backend, _preview_tolerance
+    if backend not in ('occ', 'mesh'):
+        raise ValueError(f'Unknown backend {backend!r}.')
+    previous = _backend
+    _backend = backend
+    _preview_tolerance = tolerance
+    return previous
+
+
+# memory accounting
+_lean = False
+_track_memory = False
+_memory_report = {}
+_memory_lock = threading.Lock()
+
+# rough sizes in bytes of B-rep entities with their geometry, used
+# by Solid.memory_size
+_VERTEX_BYTES = 200
+_EDGE_BYTES = 800
+_FACE_BYTES = 1500
+
+
+def set_memory_mode(lean=False, track=False):
+    """Configure how memory is used and accounted for.
+    In lean mode boolean operations do not record their history,
+    tessellations and topology indexes are not kept with the solids,
+    and the triangulations a solid adds to the faces of its shape are
+    removed once they have been read or written.  This suits long
+    generated build chains.
+    :param lean if true use lean mode
+    :param track if true record the memory use of each operation for memory_report
+    """
+    global _lean, _track_memory
+    _lean = lean
+    _track_memory = track
+
+
+def _rss():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return _peak_rss()
+
+
+def _peak_rss():
+    # high-water mark of the resident set size, since the last
+    # _reset_peak_rss where that works, otherwise over the process lifetime
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _reset_peak_rss():
+    # reset the high-water mark to the current resident set size (Linux),
+    # return whether that was possible
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+_tracking = threading.local()
+
+
+def _tracked(fn):
+    # Only the outermost tracked call of a thread resets the high-water
+    # mark, so it still covers the tracked calls nested inside it.  Where
+    # the mark cannot be reset, the peak of a call is only known when it
+    # raises the lifetime mark, otherwise the size after the call is used.
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _track_memory:
+            return fn(*args, **kwargs)
+        depth = getattr(_tracking, 'depth', 0)
+        reset = depth == 0 and _reset_peak_rss()
+        before = _rss()
+        start = _peak_rss()
+        _tracking.depth = depth + 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _tracking.depth = depth
+            after = _rss()
+            peak = _peak_rss()
+            if not reset and peak <= start:
+                peak = after
+            peak = max(peak, after)
+            with _memory_lock:
+                entry = _memory_report.setdefault(fn.__name__, {
+                    'calls': 0, 'rss': 0, 'peak_rss': 0, 'growth': 0})
+                entry['calls'] += 1
+                entry['rss'] = max(entry['rss'], after)
+                entry['peak_rss'] = max(entry['peak_rss'], peak)
+                entry['growth'] = max(entry['growth'], peak - before)
+    return wrapper
+
+
+def memory_report(reset=False):
+    """Report the memory use of each operation since tracking was enabled with set_memory_mode.
+    For each operation name the report gives the number of calls, the
+    largest resident set size after a call (rss), the largest resident
+    set size reached during a call (peak_rss), and the largest rise of
+    the resident set size over one call up to that peak (growth), all
+    in bytes.  Peaks are exact on Linux, elsewhere a peak below the
+    earlier high-water mark of the process is missed.  The sizes are
+    those of the whole process, so operations running in other threads
+    at the same time blur the figures of each other.
+    :param reset if true clear the report after returning it
+    :return a dict of dicts keyed by operation name
+    """
+    with _memory_lock:
+        report = {k: dict(v) for k, v in _memory_report.items()}
+        if reset:
+            _memory_report.clear()
+    return report
+
+
+def _boolean(builder, shape, tool):
+    if not _lean:
+        return builder(shape, tool).Shape()
+    op = builder()
+    arguments = TopTools_ListOfShape()
+    arguments.Append(shape)
+    tools = TopTools_ListOfShape()
+    tools.Append(tool)
+    op.SetArguments(arguments)
+    op.SetTools(tools)
+    op.SetToFillHistory(False)
+    op.Build()
+    return op.Shape()
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, tuple):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, Topology):
+        return sum(_nbytes(v) for v in vars(value).values()) + (
+            len(value.faces) + len(value.edges)) * 64
+    return 0
+
+
+async def _run_async(fn, *args, timeout=None, **kwargs):
+    # The limiter slot is held until the worker really finishes, not
+    # when the awaiting task is cancelled or times out, so abandoned
+    # operations still count against the concurrency (and memory) bound.
+    # The timeout covers both waiting for a slot and running, though on
+    # a thread executor it cannot fire while a worker holds the GIL.
+    loop = asyncio.get_running_loop()
+    limiter = _get_limiter(loop)
+    deadline = None if timeout is None else loop.time() + timeout
+    await asyncio.wait_for(limiter.acquire(), timeout)
+    try:
+        future = _get_executor().submit(functools.partial(fn, *args, **kwargs))
+    except BaseException:
+        limiter.release()
+        raise
+
+    def release(_):
+        try:
+            loop.call_soon_threadsafe(limiter.release)
+        except RuntimeError:  # event loop already closed
+            pass
+
+    future.add_done_callback(release)
+    remaining = None if deadline is None else max(0, deadline - loop.time())
+    return await asyncio.wait_for(asyncio.wrap_future(future), remaining)
+
+
+@_tracked
 def load_step(filename):
     """Load the given STEP File.
     :param filename the path of the STEP file
@@ -87,6 +382,439 @@ def load_step(filename):
     return Solid(step_reader.Shape(1))
 
 
+async def load_step_async(filename, timeout=None):
+    """Load the given STEP File without blocking the event loop.
+    :param filename the path of the STEP file
+    :param timeout the number of seconds to wait before raising asyncio.TimeoutError
+    :return a Solid object
+    """
+    return await _run_async(load_step, filename, timeout=timeout)
+
+
+def _map_chunks(fn, points, workers=None, chunk_size=10000):
+    # fn is called once per chunk so it can set up its OpenCASCADE
+    # query object once and reuse it for every point of the chunk
+    chunks = [points[i:i + chunk_size]
+              for i in range(0, len(points), chunk_size)] or [points]
+    if len(chunks) == 1 or workers == 1:
+        return np.concatenate([fn(c) for c in chunks])
+    with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+        return np.concatenate(list(pool.map(fn, chunks)))
+
+
+def _open_output(filename, shape, dtype):
+    if filename is None:
+        return np.empty(shape, dtype=dtype)
+    return np.lib.format.open_memmap(filename, mode='w+', dtype=dtype, shape=shape)
+
+
+def _scratch(out, shape, dtype):
+    # working array for computing out, memory-mapped to a temporary
+    # file next to it when out is, so neither is held in memory
+    if not isinstance(out, np.memmap):
+        return np.empty(shape, dtype=dtype)
+    with tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(out.filename))) as f:
+        return np.memmap(f, dtype=dtype, mode='w+', shape=shape)
+
+
+def _voxel_slabs(tri, origin, pitch, shape):
+    # Cast a ray up the Z axis through every voxel column and count the
+    # triangles it crosses below each voxel center, an odd count is inside.
+    # The rays are nudged off the voxel centers so they never pass exactly
+    # through a mesh edge or vertex.  Yields the voxels one YZ slab at a time.
+    nx, ny, nz = shape
+    x = origin[0] + (np.arange(nx) + .5 + 1e-6 * np.sqrt(2)) * pitch
+    y = origin[1] + (np.arange(ny) + .5 + 1e-6 * np.sqrt(3)) * pitch
+    z = origin[2] + (np.arange(nz) + .5) * pitch
+    a, b, c = tri[:, 0], tri[:, 1], tri[:, 2]
+    det = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    lo = tri.min(axis=1)
+    hi = tri.max(axis=1)
+    for i in range(nx):
+        # triangles under this YZ slab, vertical ones are never crossed
+        sel = np.flatnonzero((lo[:, 0] <= x[i]) & (hi[:, 0] >= x[i]) & (det != 0))
+        j0 = np.searchsorted(y, lo[sel, 1], 'left')
+        count = np.searchsorted(y, hi[sel, 1], 'right') - j0
+        # one row per (triangle, column) pair the triangle might cover
+        t = np.repeat(sel, count)
+        j = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count - j0, count)
+        px, py = x[i] - a[t, 0], y[j] - a[t, 1]
+        u = (px * (c[t, 1] - a[t, 1]) - py * (c[t, 0] - a[t, 0])) / det[t]
+        v = (py * (b[t, 0] - a[t, 0]) - px * (b[t, 1] - a[t, 1])) / det[t]
+        hit = (u >= 0) & (v >= 0) & (u + v <= 1)
+        zc = (a[t, 2] + u * (b[t, 2] - a[t, 2]) + v * (c[t, 2] - a[t, 2]))[hit]
+        crossings = np.zeros((ny, nz + 1), dtype=np.int32)
+        np.add.at(crossings, (j[hit], np.searchsorted(z, zc, 'right')), 1)
+        yield np.cumsum(crossings[:, :nz], axis=1) % 2 == 1
+
+
+def _voxelize(tri, origin, pitch, out):
+    for i, slab in enumerate(_voxel_slabs(tri, origin, pitch, out.shape)):
+        out[i] = slab
+    return out
+
+
+def _closest_point(p, a, b, c):
+    # Closest point on each triangle a, b, c to the matching point p, from
+    # the Voronoi region of the triangle the point lies in (Ericson,
+    # Real-Time Collision Detection 5.1.5), all arguments are (M, 3) arrays.
+    ab, ac, bc = b - a, c - a, c - b
+    ap, bp, cp = p - a, p - b, p - c
+    d1, d2 = np.einsum('ij,ij->i', ab, ap), np.einsum('ij,ij->i', ac, ap)
+    d3, d4 = np.einsum('ij,ij->i', ab, bp), np.einsum('ij,ij->i', ac, bp)
+    d5, d6 = np.einsum('ij,ij->i', ab, cp), np.einsum('ij,ij->i', ac, cp)
+    va, vb, vc = d3 * d6 - d5 * d4, d5 * d2 - d1 * d6, d1 * d4 - d3 * d2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s_ab = d1 / (d1 - d3)
+        s_ac = d2 / (d2 - d6)
+        s_bc = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        v = vb / (va + vb + vc)
+        w = vc / (va + vb + vc)
+        return np.select([
+            ((d1 <= 0) & (d2 <= 0))[:, None],
+            ((d3 >= 0) & (d4 <= d3))[:, None],
+            ((d6 >= 0) & (d5 <= d6))[:, None],
+            ((vc <= 0) & (d1 >= 0) & (d3 <= 0))[:, None],
+            ((vb <= 0) & (d2 >= 0) & (d6 <= 0))[:, None],
+            ((va <= 0) & (d4 >= d3) & (d5 >= d6))[:, None],
+        ], [
+            a, b, c,
+            a + s_ab[:, None] * ab,
+            a + s_ac[:, None] * ac,
+            b + s_bc[:, None] * bc,
+        ], a + v[:, None] * ab + w[:, None] * ac)
+
+
+def _bvh(tri, leaf=4):
+    # Bounding volume hierarchy over the triangles as a list of (lo, hi)
+    # box arrays per level, root first, where node i has children 2i and
+    # 2i + 1.  Built top down by splitting every node at the median of
+    # its longest axis, with the triangles padded to a power of two
+    # leaves by repeating the last one.
+    tri = tri[np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]).any(axis=1)]
+    if len(tri) == 0:
+        raise ValueError('Solid has no triangles.')
+    depth = max(0, int(np.ceil(np.log2(len(tri) / leaf))))
+    n = leaf << depth
+    tri = np.concatenate([tri, np.repeat(tri[-1:], n - len(tri), axis=0)])
+    center = tri.mean(axis=1)
+    order = np.arange(n)
+    for level in range(depth):
+        c = center[order].reshape(1 << level, -1, 3)
+        axis = (c.max(axis=1) - c.min(axis=1)).argmax(axis=1)
+        key = np.take_along_axis(c, axis[:, None, None], axis=2).ravel()
+        order = order[np.lexsort((key, np.arange(n) // c.shape[1]))]
+    tri = tri[order]
+    boxes = tri.reshape(-1, leaf * 3, 3)
+    levels = [(boxes.min(axis=1), boxes.max(axis=1))]
+    while len(levels[0][0]) > 1:
+        lo, hi = levels[0]
+        levels.insert(0, (np.minimum(lo[0::2], lo[1::2]), np.maximum(hi[0::2], hi[1::2])))
+    return tri, leaf, levels
+
+
+def _nearest(points, bvh, budget=1 << 14):
+    # Unsigned distance from each point to the nearest triangle and the
+    # index of that triangle in bvh[0].  Walk the hierarchy a level at a
+    # time for a block of points at once, dropping the nodes whose box is
+    # farther than the far corner of the nearest box seen so far, then
+    # test the triangles of the remaining leaves.
+    tri, leaf, levels = bvh
+    result = np.empty(len(points))
+    index = np.empty(len(points), dtype=np.int64)
+    for start in range(0, len(points), budget):
+        chunk = points[start:start + budget]
+        best = np.full(len(chunk), np.inf)
+        p = np.arange(len(chunk))
+        node = np.zeros(len(chunk), dtype=np.int64)
+        for depth, (lo, hi) in enumerate(levels):
+            if depth:
+                p, node = np.repeat(p, 2), np.repeat(2 * node, 2)
+                node[1::2] += 1
+            x = chunk[p]
+            near = ((np.maximum(lo[node] - x, 0) + np.maximum(x - hi[node], 0)) ** 2).sum(axis=1)
+            far = (np.maximum(np.abs(x - lo[node]), np.abs(x - hi[node])) ** 2).sum(axis=1)
+            np.minimum.at(best, p, far)
+            keep = near <= best[p]
+            p, node = p[keep], node[keep]
+        p = np.repeat(p, leaf)
+        t = np.repeat(node * leaf, leaf) + np.tile(np.arange(leaf), len(node))
+        q = _closest_point(chunk[p], tri[t, 0], tri[t, 1], tri[t, 2])
+        d = ((chunk[p] - q) ** 2).sum(axis=1)
+        # nearest pair of each point
+        order = np.lexsort((d, p))
+        first = order[np.flatnonzero(np.diff(p[order], prepend=-1))]
+        result[start:start + len(chunk)] = np.sqrt(d[first])
+        index[start:start + len(chunk)] = t[first]
+    return result, index
+
+
+def _distance_field(tri, origin, pitch, out, budget=1 << 12):
+    # Unsigned distance from every voxel center to the triangles.  Within
+    # a narrow band of the surface each voxel takes the closest point of
+    # the triangles near it, one slab at a time like _voxelize.  Then the
+    # closest points are swept along each axis both ways, every voxel
+    # keeping the nearest of the closest points of its nine neighbours in
+    # the previous slab, a vector distance transform which may overstate
+    # distances far from the surface by a small fraction of the pitch.
+    tri = tri[np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]).any(axis=1)]
+    shape = out.shape
+    band = 2 * pitch
+    # large triangles would cover many voxels they are not near
+    if len(tri):
+        tri = _refine(tri, 16 * pitch, tri.min(axis=(0, 1)), tri.max(axis=(0, 1)))
+    centers = [origin[k] + (np.arange(shape[k]) + .5) * pitch for k in range(3)]
+    x, y, z = centers
+    lo, hi = tri.min(axis=1) - band, tri.max(axis=1) + band
+    site = _scratch(out, shape + (3,), np.float32)
+    site[...] = np.nan
+    out[...] = np.inf
+    for i in range(shape[0]):
+        sel = np.flatnonzero((lo[:, 0] <= x[i]) & (hi[:, 0] >= x[i]))
+        j0 = np.searchsorted(y, lo[sel, 1], 'left')
+        k0 = np.searchsorted(z, lo[sel, 2], 'left')
+        nj = np.searchsorted(y, hi[sel, 1], 'right') - j0
+        nk = np.searchsorted(z, hi[sel, 2], 'right') - k0
+        count = nj * nk
+        # triangles in batches of about budget (triangle, voxel) pairs
+        batch = np.searchsorted(np.cumsum(count), np.arange(0, count.sum(), budget), 'right')
+        dist = np.full(shape[1] * shape[2], band * band)
+        near = np.full((shape[1] * shape[2], 3), np.nan)
+        for m0, m1 in zip(batch, np.append(batch[1:], len(sel))):
+            # one row per (triangle, voxel) pair the triangle might be near
+            c = count[m0:m1]
+            n = np.repeat(np.arange(m0, m1), c)
+            r = np.arange(c.sum()) - np.repeat(np.cumsum(c) - c, c)
+            j, k, t = j0[n] + r // nk[n], k0[n] + r % nk[n], sel[n]
+            p = np.stack([np.full(len(t), x[i]), y[j], z[k]], axis=1)
+            q = _closest_point(p, tri[t, 0], tri[t, 1], tri[t, 2])
+            d = ((p - q) ** 2).sum(axis=1)
+            # nearest pair of each voxel
+            cell = j * shape[2] + k
+            order = np.lexsort((d, cell))
+            first = order[np.flatnonzero(np.diff(cell[order], prepend=-1))]
+            first = first[d[first] <= dist[cell[first]]]
+            dist[cell[first]] = d[first]
+            near[cell[first]] = q[first]
+        found = ~np.isnan(near[:, 0])
+        out[i].reshape(-1)[found] = np.sqrt(dist[found])
+        site[i].reshape(-1, 3)[found] = near[found]
+    grid = np.meshgrid(*centers, indexing='ij', sparse=True)
+    for axis in range(3):
+        o, s = np.moveaxis(out, axis, 0), np.moveaxis(site, axis, 0)
+        c = [np.moveaxis(np.broadcast_to(g, shape), axis, 0) for g in grid]
+        n = shape[axis]
+        for step, indices in ((1, range(1, n)), (-1, range(n - 2, -1, -1))):
+            for i in indices:
+                p = np.stack([c[0][i], c[1][i], c[2][i]], axis=-1)
+                prev = np.pad(s[i - step], ((1, 1), (1, 1), (0, 0)), constant_values=np.nan)
+                for dj in range(3):
+                    for dk in range(3):
+                        q = prev[dj:dj + s.shape[1], dk:dk + s.shape[2]]
+                        v = p - q
+                        d = np.sqrt(np.einsum('...i,...i', v, v))
+                        better = d < o[i]
+                        o[i][better] = d[better]
+                        s[i][better] = q[better]
+    return out
+
+
+def _inside_mesh(points, tri):
+    # Cast a ray up the Z axis from every point and count the triangles
+    # it crosses, an odd count is inside.  Triangles are binned in a
+    # uniform XY grid so each ray is only tested against its own cell.
+    # The rays are nudged so they never pass exactly through an edge.
+    inside = np.zeros(len(points), dtype=bool)
+    if len(tri) == 0 or len(points) == 0:
+        return inside
+    lo, hi = tri[..., :2].min(axis=(0, 1)), tri[..., :2].max(axis=(0, 1))
+    n = max(1, int(np.sqrt(len(tri))))
+    cell = np.maximum(hi - lo, 1e-12) / n
+    xy = points[:, :2] + np.array([np.sqrt(2), np.sqrt(3)]) * 1e-7 * cell * n
+    # (triangle, cell) pairs for every cell each triangle's box covers
+    c0 = np.clip(((tri[..., :2].min(axis=1) - lo) / cell).astype(int), 0, n - 1)
+    c1 = np.clip(((tri[..., :2].max(axis=1) - lo) / cell).astype(int), 0, n - 1)
+    span = c1 - c0 + 1
+    count = span[:, 0] * span[:, 1]
+    t = np.repeat(np.arange(len(tri)), count)
+    k = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    key = (c0[t, 0] + k // span[t, 1]) * n + c0[t, 1] + k % span[t, 1]
+    order = np.argsort(key, kind='stable')
+    t = t[order]
+    start = np.searchsorted(key[order], np.arange(n * n + 1))
+    # (point, triangle) pairs for every triangle in each point's cell
+    valid = np.flatnonzero(np.all((xy >= lo) & (xy <= hi), axis=1))
+    pc = np.clip(((xy[valid] - lo) / cell).astype(int), 0, n - 1)
+    pc = pc[:, 0] * n + pc[:, 1]
+    count = start[pc + 1] - start[pc]
+    p = np.repeat(valid, count)
+    t = t[np.arange(count.sum()) - np.repeat(np.cumsum(count) - count - start[pc], count)]
+    a, b, c = tri[t, 0], tri[t, 1], tri[t, 2]
+    det = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    px, py = xy[p, 0] - a[:, 0], xy[p, 1] - a[:, 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u = (px * (c[:, 1] - a[:, 1]) - py * (c[:, 0] - a[:, 0])) / det
+        v = (py * (b[:, 0] - a[:, 0]) - px * (b[:, 1] - a[:, 1])) / det
+        z = a[:, 2] + u * (b[:, 2] - a[:, 2]) + v * (c[:, 2] - a[:, 2])
+        hit = (det != 0) & (u >= 0) & (v >= 0) & (u + v <= 1) & (z > points[p, 2])
+    return np.bincount(p[hit], minlength=len(points)) % 2 == 1
+
+
+def _refine(tri, size, lo, hi):
+    # split the triangles within the box lo, hi into four until
+    # none of their edges are longer than size
+    while True:
+        edges = np.linalg.norm(tri - np.roll(tri, 1, axis=1), axis=-1).max(axis=1)
+        near = np.all(tri.max(axis=1) >= lo, axis=1) & np.all(tri.min(axis=1) <= hi, axis=1)
+        split = near & (edges > size)
+        if not split.any():
+            return tri
+        a, b, c = tri[split, 0], tri[split, 1], tri[split, 2]
+        ab, bc, ca = (a + b) / 2, (b + c) / 2, (c + a) / 2
+        tri = np.concatenate([tri[~split], np.stack([
+            np.stack([a, ab, ca], axis=1), np.stack([ab, b, bc], axis=1),
+            np.stack([ca, bc, c], axis=1), np.stack([ab, bc, ca], axis=1),
+        ], axis=1).reshape(-1, 3, 3)])
+
+
+def _classify(tri, other, tol):
+    # Where the centroids of the triangles lie against the other mesh:
+    # inside it, or on a face of it, that is within tol of a parallel
+    # triangle straight above or below it, facing the same or the
+    # opposite way.
+    centroid = tri.mean(axis=1)
+    inside = _inside_mesh(centroid, other)
+    if len(centroid) == 0 or len(other) == 0:
+        return inside, np.zeros_like(inside), np.zeros_like(inside)
+    bvh = _bvh(other)
+    dist, index = _nearest(centroid, bvh)
+    face = bvh[0][index]
+    normal = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    other_normal = np.cross(face[:, 1] - face[:, 0], face[:, 2] - face[:, 0])
+    normal /= np.linalg.norm(normal, axis=1)[:, None]
+    other_normal /= np.linalg.norm(other_normal, axis=1)[:, None]
+    cos = np.einsum('ij,ij->i', normal, other_normal)
+    # the part of the distance along the face, zero unless the centroid
+    # is off the side of the face
+    height = np.einsum('ij,ij->i', centroid - face[:, 0], other_normal)
+    lateral = np.sqrt(np.maximum(dist ** 2 - height ** 2, 0))
+    on = (dist <= tol) & (lateral <= tol * 1e-3) & (np.abs(cos) >= .99)
+    return inside, on & (cos > 0), on & (cos < 0)
+
+
+def _mesh_boolean(op, a, b, size):
+    # Approximate boolean of two closed triangle meshes: keep or drop
+    # whole triangles by whether their centroid is inside the other mesh.
+    # Triangles near the other mesh are refined first so the seam is
+    # within size of the exact one.  Where the meshes share a face, the
+    # triangles of a are kept once if both solids lie on the same side of
+    # it and both are dropped if they lie on opposite sides, the other
+    # way around for a difference.
+    a = _refine(a, size, b.min(axis=(0, 1)), b.max(axis=(0, 1)))
+    b = _refine(b, size, a.min(axis=(0, 1)), a.max(axis=(0, 1)))
+    a_in, a_same, a_opposite = _classify(a, b, size / 4)
+    b_in, b_same, b_opposite = _classify(b, a, size / 4)
+    a_off = ~(a_same | a_opposite)
+    b_off = ~(b_same | b_opposite)
+    if op == 'union':
+        return np.concatenate([a[a_off & ~a_in | a_same], b[b_off & ~b_in]])
+    if op == 'intersection':
+        return np.concatenate([a[a_off & a_in | a_same], b[b_off & b_in]])
+    return np.concatenate([a[a_off & ~a_in | a_opposite], b[b_off & b_in, ::-1]])
+
+
+def _write_mesh_stl(tri, filename, mode):
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        normals = np.nan_to_num(normals / np.linalg.norm(normals, axis=1)[:, None])
+    if mode == 'ascii':
+        with open(filename, 'w') as f:
+            f.write('solid csgstep\n')
+            for n, t in zip(normals, tri):
+                f.write('facet normal %e %e %e\n outer loop\n' % tuple(n))
+                for v in t:
+                    f.write('  vertex %e %e %e\n' % tuple(v))
+                f.write(' endloop\nendfacet\n')
+            f.write('endsolid csgstep\n')
+    else:
+        data = np.zeros(len(tri), dtype=[('normal', '<f4', 3),
+            ('vertices', '<f4', (3, 3)), ('attr', '<u2')])
+        data['normal'] = normals
+        data['vertices'] = tri
+        with open(filename, 'wb') as f:
+            f.write(b'csgstep'.ljust(80, b' '))
+            f.write(np.uint32(len(tri)).tobytes())
+            data.tofile(f)
+
+
+def _mesh_solid(tri):
+    solid = Solid()
+    solid._mesh = tri
+    return solid
+
+
+def _use_mesh(solids):
+    solids = [s for s in solids if s._shape is not None or s._mesh is not None]
+    if any(s._mesh is not None for s in solids):
+        return True
+    return (_backend == 'mesh' and len(solids) > 1 and
+            all(s.num_solids for s in solids))
+
+
+def _preview_meshes(solids):
+    # tessellate the non-empty solids with a common tolerance
+    solids = [s for s in solids if s._shape is not None or s._mesh is not None]
+    tolerance = _preview_tolerance or min(
+        np.linalg.norm(np.subtract(*s.bounds)) for s in solids) / 100
+    return [s._tessellation(tolerance) for s in solids], tolerance
+
+
+def _mesh_reduce(op, solids):
+    meshes, tolerance = _preview_meshes(solids)
+    result = meshes[0]
+    for mesh in meshes[1:]:
+        result = _mesh_boolean(op, result, mesh, 4 * tolerance)
+    return _mesh_solid(result)
+
+
+def _measure(solid):
+    return tuple(getattr(solid, k) for k in _MEASURES)
+
+
+_MEASURES = ('volume', 'area', 'center_of_mass', 'bounds',
+    'num_solids', 'num_faces', 'num_edges', 'num_vertices')
+
+
+def measure_many(solids, workers=None, executor='thread'):
+    """Measure the mass properties and topology of many solids in parallel.
+    Use a process executor if the OpenCASCADE build holds the GIL.
+    :param solids the Solid objects to measure
+    :param workers the number of workers, defaults to the number of CPUs
+    :param executor 'thread', 'process' or a concurrent.futures.Executor object
+    :return a dict of NumPy arrays keyed by property name, one row per solid
+    """
+    solids = list(solids)
+    pool = _make_executor(executor, workers)
+    try:
+        chunksize = max(1, len(solids) // (4 * (workers or os.cpu_count() or 1)))
+        results = list(pool.map(_measure, solids, chunksize=chunksize))
+    finally:
+        if pool is not executor:
+            pool.shutdown()
+    columns = list(zip(*results)) if results else [()] * len(_MEASURES)
+    data = dict(zip(_MEASURES, columns))
+    return {
+        'volume': np.array(data['volume'], dtype=float),
+        'area': np.array(data['area'], dtype=float),
+        'center_of_mass': np.array(data['center_of_mass'], dtype=float).reshape(-1, 3),
+        'bounds': np.array(data['bounds'], dtype=float).reshape(-1, 2, 3),
+        'num_solids': np.array(data['num_solids'], dtype=int),
+        'num_faces': np.array(data['num_faces'], dtype=int),
+        'num_edges': np.array(data['num_edges'], dtype=int),
+        'num_vertices': np.array(data['num_vertices'], dtype=int),
+    }
+
+
 def sphere(r=1):
     """Create a sphere of the given radius centered at the origin.
     :param r the radius of the sphere
@@ -205,6 +933,175 @@ def polygon(points):
     return Solid(BRepBuilderAPI_MakeFace(wire).Shape())
 
 
+def _select(selector, topology, count):
+    # turn a fillet, chamfer or draft selector into an array of indices
+    if selector is None:
+        return np.arange(count)
+    if callable(selector):
+        selector = selector(topology)
+    selector = np.asarray(selector)
+    if selector.dtype == bool:
+        if selector.shape != (count,):
+            raise ValueError(f'Selection mask has shape {selector.shape}, expected ({count},).')
+        return np.flatnonzero(selector)
+    selector = selector.astype(int).reshape(-1)
+    if np.any((selector < 0) | (selector >= count)):
+        raise ValueError(f'Selection index out of range for {count} entities.')
+    return selector
+
+
+def _shape_bounds(shape):
+    box = Bnd_Box()
+    brepbndlib.AddOptimal(shape, box, True, False)
+    if box.IsVoid():
+        return np.full((2, 3), np.nan)
+    return np.array(box.Get()).reshape(2, 3)
+
+
+def _bare_faces(shape):
+    # the faces of shape without a triangulation
+    faces = TopTools_IndexedMapOfShape()
+    topexp.MapShapes(shape, TopAbs_FACE, faces)
+    faces = (topods.Face(faces.FindKey(i)) for i in range(1, faces.Size() + 1))
+    return [face for face in faces
+            if BRep_Tool.Triangulation(face, TopLoc_Location()) is None]
+
+
+class Topology:
+    def __init__(self, shape):
+        """Index the faces and edges of a TopoDS object.
+        The faces and edges lists hold the indexed shapes.  The arrays
+        face_type, face_normal, face_area and face_bounds, and edge_type,
+        edge_direction, edge_length and edge_bounds hold their properties
+        by index, each computed the first time it is used.  Normals are
+        only set for planar faces and directions only for straight edges,
+        otherwise they are NaN.
+        :param shape the TopoDS object to index
+        """
+        faces = TopTools_IndexedMapOfShape()
+        topexp.MapShapes(shape, TopAbs_FACE, faces)
+        self.faces = [topods.Face(faces.FindKey(i))
+                      for i in range(1, faces.Size() + 1)]
+        edges = TopTools_IndexedMapOfShape()
+        topexp.MapShapes(shape, TopAbs_EDGE, edges)
+        self.edges = [topods.Edge(edges.FindKey(i))
+                      for i in range(1, edges.Size() + 1)]
+
+    # The property arrays are only computed the first time they are used,
+    # so indexing a shape for a fillet of all its edges costs nothing more.
+
+    @functools.cached_property
+    def face_type(self):
+        return np.array([BRepAdaptor_Surface(face, True).GetType()
+                         for face in self.faces], dtype=int)
+
+    @functools.cached_property
+    def face_normal(self):
+        normal = np.full((len(self.faces), 3), np.nan)
+        for i, face in enumerate(self.faces):
+            surface = BRepAdaptor_Surface(face, True)
+            if surface.GetType() == GeomAbs_Plane:
+                d = surface.Plane().Axis().Direction()
+                sign = -1 if face.Orientation() == TopAbs_REVERSED else 1
+                normal[i] = sign * np.array([d.X(), d.Y(), d.Z()])
+        return normal
+
+    @functools.cached_property
+    def face_area(self):
+        area = np.empty(len(self.faces))
+        for i, face in enumerate(self.faces):
+            props = GProp_GProps()
+            brepgprop.SurfaceProperties(face, props)
+            area[i] = props.Mass()
+        return area
+
+    @functools.cached_property
+    def face_bounds(self):
+        return np.array([_shape_bounds(face)
+                         for face in self.faces]).reshape(-1, 2, 3)
+
+    @functools.cached_property
+    def edge_type(self):
+        return np.array([-1 if BRep_Tool.Degenerated(edge) else
+                         BRepAdaptor_Curve(edge).GetType()
+                         for edge in self.edges], dtype=int)
+
+    @functools.cached_property
+    def edge_direction(self):
+        direction = np.full((len(self.edges), 3), np.nan)
+        for i, edge in enumerate(self.edges):
+            if BRep_Tool.Degenerated(edge):
+                continue
+            curve = BRepAdaptor_Curve(edge)
+            if curve.GetType() == GeomAbs_Line:
+                d = curve.Line().Direction()
+                direction[i] = d.X(), d.Y(), d.Z()
+        return direction
+
+    @functools.cached_property
+    def edge_length(self):
+        length = np.zeros(len(self.edges))
+        for i, edge in enumerate(self.edges):
+            if BRep_Tool.Degenerated(edge):
+                continue
+            props = GProp_GProps()
+            brepgprop.LinearProperties(edge, props)
+            length[i] = props.Mass()
+        return length
+
+    @functools.cached_property
+    def edge_bounds(self):
+        return np.array([
+            np.full((2, 3), np.nan) if BRep_Tool.Degenerated(edge) else
+            _shape_bounds(edge) for edge in self.edges]).reshape(-1, 2, 3)
+
+    def edges_parallel(self, v, tol=1e-6):
+        """Select the straight edges parallel to the given axis.
+        :param v the 3D vector the edges should be parallel to
+        :param tol the tolerance on the sine of the angle between edge and axis
+        :return a boolean array over the edges
+        """
+        v = np.asarray(v, dtype=float) / np.linalg.norm(v)
+        sine = np.linalg.norm(np.cross(self.edge_direction, v), axis=1)
+        return sine <= tol
+
+    def edges_in_box(self, lo, hi):
+        """Select the edges lying entirely inside the given box.
+        :param lo the lowest corner of the box as a 3D vector
+        :param hi the highest corner of the box as a 3D vector
+        :return a boolean array over the edges
+        """
+        return (np.all(self.edge_bounds[:, 0] >= lo, axis=1) &
+                np.all(self.edge_bounds[:, 1] <= hi, axis=1))
+
+    def faces_normal(self, v, tol=1e-6):
+        """Select the planar faces whose outward normal points along the given axis.
+        :param v the 3D vector the face normals should point along
+        :param tol the tolerance on the cosine of the angle between normal and axis
+        :return a boolean array over the faces
+        """
+        v = np.asarray(v, dtype=float) / np.linalg.norm(v)
+        return self.face_normal @ v >= 1 - tol
+
+    def faces_perpendicular(self, v, tol=1e-6):
+        """Select the planar faces parallel to the given axis, that is whose normal is perpendicular to it.
+        :param v the 3D vector the faces should be parallel to
+        :param tol the tolerance on the cosine of the angle between normal and axis
+        :return a boolean array over the faces
+        """
+        v = np.asarray(v, dtype=float) / np.linalg.norm(v)
+        return np.abs(self.face_normal @ v) <= tol
+
+    def faces_in_box(self, lo, hi):
+        """Select the faces lying entirely inside the given box.
+        :param lo the lowest corner of the box as a 3D vector
+        :param hi the highest corner of the box as a 3D vector
+        :return a boolean array over the faces
+        """
+        return (np.all(self.face_bounds[:, 0] >= lo, axis=1) &
+                np.all(self.face_bounds[:, 1] <= hi, axis=1))
+
+
 class Solid:
     def __init__(self, shape=None, name=None):
         """Instantiate Solid class with a TopoDS object.
@@ -213,6 +1110,9 @@ class Solid:
         """
         self._shape = shape
         self._name = name
+        self._mesh = None
+        self._cache = {}
+        self._meshed = []
 
     @property
     def name(self):
@@ -226,6 +1126,159 @@ class Solid:
     def name(self, value):
         self._name = value
 
+    def _cached(self, key, fn):
+        # solids are immutable so derived values can be kept for good,
+        # except the bulky ones in lean mode
+        if key in self._cache:
+            return self._cache[key]
+        if self._shape is None and self._mesh is None:
+            raise ValueError('Solid is empty.')
+        value = fn()
+        kind = key[0] if isinstance(key, tuple) else key
+        if not (_lean and kind in ('tessellation', 'topology')):
+            self._cache[key] = value
+        return value
+
+    def release(self):
+        """Release the cached properties, tessellations and topology index of this solid,
+        and remove the triangulations it added to its shape.  Solids share
+        unchanged faces with the solids they were made from, triangulations
+        those faces already had are left to the solids that added them.
+        """
+        self._cache.clear()
+        for face in self._meshed:
+            breptools.Clean(face)
+        self._meshed = []
+
+    def _drop_triangulations(self, faces):
+        # remove the triangulations this solid added to the given faces,
+        # right away in lean mode, otherwise on release
+        if _lean:
+            for face in faces:
+                breptools.Clean(face)
+        else:
+            self._meshed.extend(faces)
+
+    def memory_size(self):
+        """Estimate the memory used by this solid.
+        The estimate covers the B-rep entities and triangulations of the
+        shape, the preview mesh and the cached data.  Shapes shared with
+        other solids are counted in full.
+        :return the estimated size in bytes
+        """
+        size = sum(_nbytes(v) for v in self._cache.values())
+        if self._mesh is not None:
+            size += self._mesh.nbytes
+        if self._shape is not None:
+            shapes = TopTools_IndexedMapOfShape()
+            for kind, nbytes in ((TopAbs_VERTEX, _VERTEX_BYTES),
+                                 (TopAbs_EDGE, _EDGE_BYTES)):
+                topexp.MapShapes(self._shape, kind, shapes)
+                size += shapes.Size() * nbytes
+                shapes.Clear()
+            topexp.MapShapes(self._shape, TopAbs_FACE, shapes)
+            for i in range(1, shapes.Size() + 1):
+                size += _FACE_BYTES
+                poly = BRep_Tool.Triangulation(topods.Face(shapes.FindKey(i)), TopLoc_Location())
+                if poly is not None:
+                    size += poly.NbNodes() * 24 + poly.NbTriangles() * 12
+        return size
+
+    def _exact(self):
+        if self._mesh is not None:
+            raise ValueError('Not available for mesh solids, rebuild with set_backend("occ").')
+        return self._shape
+
+    def _volume_properties(self):
+        def compute():
+            if self._mesh is not None:
+                a, b, c = self._mesh[:, 0], self._mesh[:, 1], self._mesh[:, 2]
+                v = np.einsum('ij,ij->i', a, np.cross(b, c)) / 6
+                return v.sum(), (v[:, None] * (a + b + c)).sum(axis=0) / 4 / v.sum()
+            props = GProp_GProps()
+            brepgprop.VolumeProperties(self._shape, props)
+            p = props.CentreOfMass()
+            return props.Mass(), np.array([p.X(), p.Y(), p.Z()])
+        return self._cached('volume_properties', compute)
+
+    def _count(self, kind):
+        def compute():
+            shapes = TopTools_IndexedMapOfShape()
+            topexp.MapShapes(self._exact(), kind, shapes)
+            return shapes.Size()
+        return self._cached(('count', kind), compute)
+
+    @property
+    def volume(self):
+        """The volume of the solid.
+        """
+        return self._volume_properties()[0]
+
+    @property
+    def area(self):
+        """The surface area of the solid.
+        """
+        def compute():
+            if self._mesh is not None:
+                a, b, c = self._mesh[:, 0], self._mesh[:, 1], self._mesh[:, 2]
+                return np.linalg.norm(np.cross(b - a, c - a), axis=1).sum() / 2
+            props = GProp_GProps()
+            brepgprop.SurfaceProperties(self._shape, props)
+            return props.Mass()
+        return self._cached('area', compute)
+
+    @property
+    def center_of_mass(self):
+        """The center of mass of the volume of the solid as a 3D vector.
+        """
+        return self._volume_properties()[1]
+
+    @property
+    def bounds(self):
+        """The bounding box of the solid.
+        Given as the array [[xmin, ymin, zmin], [xmax, ymax, zmax]].
+        """
+        def compute():
+            if self._mesh is not None:
+                return np.array([self._mesh.min(axis=(0, 1)), self._mesh.max(axis=(0, 1))])
+            bounds = _shape_bounds(self._shape)
+            if np.isnan(bounds).any():
+                raise ValueError('Solid has no bounds.')
+            return bounds
+        return self._cached('bounds', compute)
+
+    @property
+    def topology(self):
+        """The Topology index of the faces and edges of the solid.
+        It is built on first use and kept with the solid.
+        """
+        return self._cached('topology', lambda: Topology(self._exact()))
+
+    @property
+    def num_solids(self):
+        """The number of solids in the shape of the solid.
+        """
+        return self._count(TopAbs_SOLID)
+
+    @property
+    def num_faces(self):
+        """The number of faces in the shape of the solid.
+        """
+        return self._count(TopAbs_FACE)
+
+    @property
+    def num_edges(self):
+        """The number of edges in the shape of the solid.
+        """
+        return self._count(TopAbs_EDGE)
+
+    @property
+    def num_vertices(self):
+        """The number of vertices in the shape of the solid.
+        """
+        return self._count(TopAbs_VERTEX)
+
+    @_tracked
     def write_step(self, filename, schema="AP203"):
         """Write this solid to a STEP file.
         :param filename name of STEP output file
@@ -234,11 +1287,12 @@ class Solid:
         step_writer = STEPControl_Writer()
         Interface_Static.SetCVal("write.step.schema", schema) 
         # use highest representation
-        step_writer.Transfer(self._shape, STEPControl_AsIs) 
+        step_writer.Transfer(self._exact(), STEPControl_AsIs) 
         status = step_writer.Write(filename)
         if status != IFSelect_RetDone:
             raise ValueError('STEP write failed.')
 
+    @_tracked
     def write_stl(self, filename, mode='ascii',
                   linear_deflection=.5, angular_deflection=0.25):
         """Write this solid to a STL file.
@@ -247,6 +1301,10 @@ class Solid:
         :param linear_deflection linear deflection value
         :param angular_deflection angular deflection value
         """
+        if self._mesh is not None:
+            _write_mesh_stl(self._mesh, filename, mode)
+            return
+        bare = _bare_faces(self._shape)
         mesh = BRepMesh_IncrementalMesh(self._shape, 
             linear_deflection, False, angular_deflection)
         mesh.Perform()
@@ -255,9 +1313,229 @@ class Solid:
         stl_exporter = StlAPI_Writer()
         stl_exporter.SetASCIIMode(mode == 'ascii')
         status = stl_exporter.Write(self._shape, filename)
+        self._drop_triangulations(bare)
         if not status:
             raise ValueError('STL write failed.')
 
+    def _tessellation(self, linear_deflection, angular_deflection=.25):
+        # triangles of the cached mesh as a (T, 3, 3) array, wound so
+        # their normals point out of the solid
+        if self._mesh is not None:
+            return self._mesh
+
+        def compute():
+            bare = _bare_faces(self._shape)
+            mesh = BRepMesh_IncrementalMesh(self._shape,
+                linear_deflection, False, angular_deflection)
+            mesh.Perform()
+            if not mesh.IsDone():
+                raise ValueError('Meshing failed.')
+            triangles = []
+            explorer = TopExp_Explorer(self._shape, TopAbs_FACE)
+            while explorer.More():
+                face = explorer.Current()
+                loc = TopLoc_Location()
+                poly = BRep_Tool.Triangulation(face, loc)
+                if poly is not None:
+                    trsf = loc.Transformation()
+                    nodes = np.array([
+                        (p.X(), p.Y(), p.Z()) for p in (
+                        poly.Node(i).Transformed(trsf)
+                        for i in range(1, poly.NbNodes() + 1))])
+                    index = np.array([poly.Triangle(i).Get()
+                        for i in range(1, poly.NbTriangles() + 1)]) - 1
+                    if face.Orientation() == TopAbs_REVERSED:
+                        index = index[:, ::-1]
+                    triangles.append(nodes[index])
+                explorer.Next()
+            self._drop_triangulations(bare)
+            return np.concatenate(triangles or [np.empty((0, 3, 3))])
+        key = ('tessellation', linear_deflection, angular_deflection)
+        return self._cached(key, compute)
+
+    def _grid(self, pitch):
+        lo, hi = self.bounds
+        shape = np.maximum(1, np.ceil((hi - lo) / pitch)).astype(int)
+        return lo, tuple(shape.tolist())
+
+    def _deflection(self, pitch=0):
+        # default tessellation tolerance for a grid of the given pitch, no
+        # finer than 1/1000 of the bounding box diagonal so that on curved
+        # solids the triangle count stops growing with the resolution
+        lo, hi = self.bounds
+        return max(pitch / 4, np.linalg.norm(hi - lo) / 1000)
+
+    @_tracked
+    def voxelize(self, pitch, filename=None, linear_deflection=None):
+        """Voxelize this solid into a boolean volume of the given pitch.
+        The voxel at index (i, j, k) is centered at bounds[0] + pitch * (i + .5, j + .5, k + .5).
+        The volume is computed from the tessellation of the solid one
+        slab at a time, so large volumes can be written to a file.
+        :param pitch the size of the sides of each voxel
+        :param filename name of .npy output file to memory-map the volume to, defaults to memory
+        :param linear_deflection linear deflection of the tessellation, defaults to pitch / 4 but no less than 1/1000 of the bounding box diagonal
+        :return a boolean NumPy array, True for voxels inside the solid
+        """
+        linear_deflection = linear_deflection or self._deflection(pitch)
+        origin, shape = self._grid(pitch)
+        out = _open_output(filename, shape, bool)
+        _voxelize(self._tessellation(linear_deflection), origin, pitch, out)
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+
+    @_tracked
+    def sdf(self, grid, filename=None, linear_deflection=None):
+        """Compute the signed distance field of this solid.
+        Distances are negative inside the solid and are measured to the
+        tessellation of the solid.  Given a pitch, distances are exact
+        within two voxels of the surface and propagated between neighbouring
+        voxels elsewhere, which may overstate them by a small fraction of the pitch.
+        :param grid the 3D points to evaluate as an (..., 3) array, or a pitch to use the voxel centers of voxelize
+        :param filename name of .npy output file to memory-map the distances to, defaults to memory, the closest points found for a pitch are then memory-mapped to a temporary file next to it
+        :param linear_deflection linear deflection of the tessellation, defaults to pitch / 4 but no less than 1/1000 of the bounding box diagonal
+        :return a float NumPy array of the distances, of shape grid.shape[:-1] or the voxelize shape
+        """
+        if np.ndim(grid) == 0:
+            pitch = grid
+            linear_deflection = linear_deflection or self._deflection(pitch)
+            origin, shape = self._grid(pitch)
+            tri = self._tessellation(linear_deflection)
+            out = _open_output(filename, shape, float)
+            _distance_field(tri, origin, pitch, out)
+            for i, inside in enumerate(_voxel_slabs(tri, origin, pitch, shape)):
+                np.negative(out[i], out=out[i], where=inside)
+        else:
+            grid = np.asarray(grid, dtype=float)
+            linear_deflection = linear_deflection or self._deflection()
+            tri = self._tessellation(linear_deflection)
+            bvh = _bvh(tri)
+            out = _open_output(filename, grid.shape[:-1], float)
+            points = grid.reshape(-1, 3)
+            flat = out.reshape(-1)
+            step = 1 << 16
+            for start in range(0, len(points), step):
+                chunk = points[start:start + step]
+                dist, _ = _nearest(chunk, bvh)
+                flat[start:start + step] = np.where(_inside_mesh(chunk, tri), -dist, dist)
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+
+    @_tracked
+    def contains(self, points, tol=1e-7, workers=None, chunk_size=10000):
+        """Test whether the given points are inside this solid.
+        Points on the boundary count as inside.  Points outside the
+        bounding box of the solid are rejected without calling openCASCADE.
+        :param points the 3D points to test as an (N, 3) array
+        :param tol the tolerance used to decide if a point is on the boundary
+        :param workers the number of threads to split the points over, defaults to the number of CPUs
+        :param chunk_size the number of points given to each thread at a time
+        :return a boolean array of length N
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if self._mesh is not None:
+            return _inside_mesh(points, self._mesh)
+        lo, hi = self.bounds
+        candidates = np.all((points >= lo - tol) & (points <= hi + tol), axis=1)
+
+        def classify(chunk):
+            classifier = BRepClass3d_SolidClassifier(self._shape)
+            inside = np.empty(len(chunk), dtype=bool)
+            for i, p in enumerate(chunk):
+                classifier.Perform(gp_Pnt(*p), tol)
+                inside[i] = classifier.State() in (TopAbs_IN, TopAbs_ON)
+            return inside
+
+        result = np.zeros(len(points), dtype=bool)
+        result[candidates] = _map_chunks(classify, points[candidates],
+            workers, chunk_size)
+        return result
+
+    @_tracked
+    def distance(self, points, workers=None, chunk_size=10000):
+        """Compute the distance from the given points to this solid.
+        The distance is zero for points inside the solid.
+        :param points the 3D points to measure from as an (N, 3) array
+        :param workers the number of threads to split the points over, defaults to the number of CPUs
+        :param chunk_size the number of points given to each thread at a time
+        :return a float array of length N
+        """
+        if self._shape is None and self._mesh is None:
+            raise ValueError('Solid is empty.')
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if self._mesh is not None:
+            dist, _ = _nearest(points, _bvh(self._mesh))
+            dist[_inside_mesh(points, self._mesh)] = 0
+            return dist
+
+        def measure(chunk):
+            dist = BRepExtrema_DistShapeShape()
+            dist.LoadS1(self._shape)
+            values = np.empty(len(chunk))
+            for i, p in enumerate(chunk):
+                dist.LoadS2(BRepBuilderAPI_MakeVertex(gp_Pnt(*p)).Vertex())
+                dist.Perform()
+                if not dist.IsDone():
+                    raise ValueError('Distance computation failed.')
+                values[i] = dist.Value()
+            return values
+
+        return _map_chunks(measure, points, workers, chunk_size)
+
+    async def write_step_async(self, filename, schema="AP203", timeout=None):
+        """Write this solid to a STEP file without blocking the event loop.
+        :param filename name of STEP output file
+        :param schema name of STEP output schema, defaults to AP203
+        :param timeout the number of seconds to wait before raising asyncio.TimeoutError
+        """
+        await _run_async(Solid.write_step, self, filename, schema, timeout=timeout)
+
+    async def write_stl_async(self, filename, mode='ascii',
+                              linear_deflection=.5, angular_deflection=0.25,
+                              timeout=None):
+        """Write this solid to a STL file without blocking the event loop.
+        :param filename name of STL output file
+        :param mode mode of STL file, whether ascii or binary
+        :param linear_deflection linear deflection value
+        :param angular_deflection angular deflection value
+        :param timeout the number of seconds to wait before raising asyncio.TimeoutError
+        """
+        await _run_async(Solid.write_stl, self, filename, mode,
+            linear_deflection, angular_deflection, timeout=timeout)
+
+    async def intersection_async(self, solid, timeout=None):
+        """Intersect this solid with the given Solid object without blocking the event loop.
+        :param solid the Solid object to intersect with
+        :param timeout the number of seconds to wait before raising asyncio.TimeoutError
+        :return a new Solid object
+        """
+        return await _run_async(Solid.intersection, self, solid, timeout=timeout)
+
+    async def difference_async(self, solid, timeout=None):
+        """Cut the given Solid object from this solid without blocking the event loop.
+        :param solid the Solid object to cut with
+        :param timeout the number of seconds to wait before raising asyncio.TimeoutError
+        :return a new Solid object
+        """
+        return await _run_async(Solid.difference, self, solid, timeout=timeout)
+
+    async def fuse_async(self, solid, timeout=None):
+        """Fuse this solid with the given Solid object without blocking the event loop.
+        :param solid the Solid object to merge with
+        :param timeout the number of seconds to wait before raising asyncio.TimeoutError
+        :return a new Solid object
+        """
+        return await _run_async(Solid.fuse, self, solid, timeout=timeout)
+
+    async def union_async(self, *solids, timeout=None):
+        """Union this solid with the given Solid objects without blocking the event loop.
+        :param *solids the Solid objects to merge with
+        :param timeout the number of seconds to wait before raising asyncio.TimeoutError
+        :return a new Solid object
+        """
+        return await _run_async(Solid.union, self, *solids, timeout=timeout)
+
     def __add__(self, solid):
         """Redirects call to the compound method.
         """
@@ -333,20 +1611,27 @@ class Solid:
         """
         return self.translate(v * np.array(UZ))
 
+    @_tracked
     def intersection(self, solid):
         """Intersect this solid with the given Solid object.
         :param solid the Solid object to intersect with
         :return a new Solid object
         """
-        return Solid(BRepAlgoAPI_Common(self._shape, solid._shape).Shape())
+        if _use_mesh([self, solid]):
+            return _mesh_reduce('intersection', [self, solid])
+        return Solid(_boolean(BRepAlgoAPI_Common, self._shape, solid._shape))
 
+    @_tracked
     def difference(self, solid):
         """Cut the given Solid object from this solid.
         :param solid the Solid object to cut with
         :return a new Solid object
         """
-        return Solid(BRepAlgoAPI_Cut(self._shape, solid._shape).Shape())
+        if _use_mesh([self, solid]):
+            return _mesh_reduce('difference', [self, solid])
+        return Solid(_boolean(BRepAlgoAPI_Cut, self._shape, solid._shape))
 
+    @_tracked
     def fuse(self, solid):
         """Fuse this solid with the given Solid object.
         The openCASCADE BRepAlgoAPI_Fuse function is used to perform 
@@ -354,8 +1639,11 @@ class Solid:
         :param solid the Solid object to merge with
         :return a new Solid object
         """
-        return Solid(BRepAlgoAPI_Fuse(self._shape, solid._shape).Shape())
+        if _use_mesh([self, solid]):
+            return _mesh_reduce('union', [self, solid])
+        return Solid(_boolean(BRepAlgoAPI_Fuse, self._shape, solid._shape))
 
+    @_tracked
     def union(self, *solids):
         """Union this solid with the given Solid objects.
         More than one Solid object can be passed as arguments for
@@ -364,6 +1652,8 @@ class Solid:
         :param *solids the Solid objects to merge with
         :return a new Solid object
         """
+        if _use_mesh([self, *solids]):
+            return _mesh_reduce('union', [self, *solids])
         shapes = TopTools_ListOfShape()
         if self._shape is not None:
             shapes.Append(self._shape)
@@ -371,9 +1661,11 @@ class Solid:
             shapes.Append(s._shape)
         mv = BOPAlgo_MakerVolume()
         mv.SetArguments(shapes)
+        mv.SetToFillHistory(not _lean)
         mv.Perform()
         return Solid(mv.Shape())
 
+    @_tracked
     def compound(self, *solids):
         """Create a compound shape with this solid and the given Solid objects.
         More than one Solid object can be passed as arguments for compounding.
@@ -381,6 +1673,9 @@ class Solid:
         :param *solids the Solid objects to compound with
         :return a new Solid object with the TopoDS_Compound shape
         """
+        if any(s._mesh is not None for s in (self, *solids)):
+            meshes, _ = _preview_meshes((self, *solids))
+            return _mesh_solid(np.concatenate(meshes))
         comp = TopoDS_Compound()
         builder = BRep_Builder()
         builder.MakeCompound(comp)
@@ -390,6 +1685,16 @@ class Solid:
             builder.Add(comp, s._shape)
         return Solid(comp)
 
+    def _transform(self, trsf, builder=BRepBuilderAPI_Transform):
+        if self._mesh is None:
+            return Solid(builder(self._shape, trsf).Shape())
+        m = np.array([[trsf.Value(i, j) for j in range(1, 5)] for i in range(1, 4)])
+        tri = self._mesh @ m[:, :3].T + m[:, 3]
+        if np.linalg.det(m[:, :3]) < 0:
+            tri = tri[:, ::-1]
+        return _mesh_solid(tri)
+
+    @_tracked
     def mirror(self, v):
         """Mirror this solid about the given axis.
         :param v the 3D vector to mirror object about
@@ -398,8 +1703,9 @@ class Solid:
         trns = gp_Trsf()
         axis = gp_Ax1(gp_Origin(), gp_Dir(*v))
         trns.SetMirror(axis)
-        return Solid(BRepBuilderAPI_Transform(self._shape, trns).Shape())
+        return self._transform(trns)
 
+    @_tracked
     def translate(self, v):
         """Translate this solid by the given 3D vector.
         :param v the 3D vector to translate object with
@@ -407,8 +1713,9 @@ class Solid:
         """
         trns = gp_Trsf()
         trns.SetTranslation(gp_Vec(*v))
-        return Solid(BRepBuilderAPI_Transform(self._shape, trns).Shape())
+        return self._transform(trns)
 
+    @_tracked
     def rotate(self, a, v):
         """Rotate this solid around the given 3D vector by the given angle. 
         :param a the angle in radians to rotate object by
@@ -418,8 +1725,9 @@ class Solid:
         trns = gp_Trsf()
         axis = gp_Ax1(gp_Origin(), gp_Dir(*v))
         trns.SetRotation(axis, a);
-        return Solid(BRepBuilderAPI_Transform(self._shape, trns).Shape())
+        return self._transform(trns)
 
+    @_tracked
     def scale(self, v):
         """Scale this solid by the given factor.
         :param v the factor to scale, given as a real or 3D vector
@@ -431,68 +1739,70 @@ class Solid:
             v[0], 0, 0,
             0, v[1], 0,
             0, 0, v[2]))
-        return Solid(BRepBuilderAPI_GTransform(self._shape, gtrns).Shape())
+        return self._transform(gtrns, BRepBuilderAPI_GTransform)
 
-    def fillet(self, r):
-        """Fillet all edges of this solid by the given radius.
-        :param radius the radius to fillet edges by
+    @_tracked
+    def fillet(self, r, edges=None):
+        """Fillet the edges of this solid by the given radius.
+        :param r the radius to fillet edges by
+        :param edges the edges to fillet as a boolean mask or indices into topology.edges, or a function of the topology returning them, defaults to all edges
         :return a new Solid object
         """
+        if self._mesh is not None:
+            return _mesh_solid(self._mesh)
+        topology = self.topology
         fillet = BRepFilletAPI_MakeFillet(self._shape)
-        explorer = TopExp_Explorer(self._shape, TopAbs_EDGE)
-        while explorer.More():
-            edge = explorer.Current()
-            fillet.Add(r, edge)
-            explorer.Next()
+        for i in _select(edges, topology, len(topology.edges)):
+            fillet.Add(r, topology.edges[i])
         return Solid(fillet.Shape())
 
-    def chamfer(self, d):
-        """Chamfer all edges of this solid by the given distance.
+    @_tracked
+    def chamfer(self, d, edges=None):
+        """Chamfer the edges of this solid by the given distance.
         :param d the distance to chamfer edges by
+        :param edges the edges to chamfer as a boolean mask or indices into topology.edges, or a function of the topology returning them, defaults to all edges
         :return a new Solid object
         """
+        if self._mesh is not None:
+            return _mesh_solid(self._mesh)
+        topology = self.topology
         chamfer = BRepFilletAPI_MakeChamfer(self._shape)
-        explorer = TopExp_Explorer(self._shape, TopAbs_EDGE)
-        while explorer.More():
-            edge = explorer.Current()
-            chamfer.Add(d, edge)
-            explorer.Next()
+        for i in _select(edges, topology, len(topology.edges)):
+            chamfer.Add(d, topology.edges[i])
         return Solid(chamfer.Shape())
 
-    def draft(self, a):
-        """Apply a draft angle to all vertical faces of this solid.
+    @_tracked
+    def draft(self, a, faces=None):
+        """Apply a draft angle to the faces of this solid.
         The vertical direction is used to measure the draft angle.
         The neutral plane is the XY plane at the origin.
         :param a the draft angle to apply
+        :param faces the faces to draft as a boolean mask or indices into topology.faces, or a function of the topology returning them, defaults to all vertical planar faces
         :return a new Solid object
         """
+        if self._mesh is not None:
+            return _mesh_solid(self._mesh)
         v = gp_DZ()
         neutral_plane = gp_Pln(gp_Origin(), v)
+        topology = self.topology
+        if faces is None:
+            faces = topology.faces_perpendicular(UZ)
         draft = BRepOffsetAPI_DraftAngle(self._shape)
-        explorer = TopExp_Explorer(self._shape, TopAbs_FACE)
-        while explorer.More():
-            face = explorer.Current()
-            surf = BRep_Tool.Surface(face)
-            geom = GeomAdaptor_Surface(surf)
-            if geom.GetType() == GeomAbs_Plane:
-                ex = TopExp_Explorer(face, TopAbs_EDGE)
-                edge = ex.Current()
-                normal = gp_Dir()
-                BOPTools_AlgoTools3D.GetNormalToFaceOnEdge(edge, face, normal)
-                if normal.IsNormal(v, 0):
-                    draft.Add(face, v, a, neutral_plane)
-            explorer.Next()
+        for i in _select(faces, topology, len(topology.faces)):
+            draft.Add(topology.faces[i], v, a, neutral_plane)
         draft.Build()
         return Solid(draft.Shape())
 
+    @_tracked
     def linear_extrude(self, v):
         """Linear extrude this (2D) solid in the Z direction by the given amount.
         :param v the amount to linear extrude by
         :return a new Solid object
         """
         v = v * np.array(UZ)
-        return Solid(BRepPrimAPI_MakePrism(self._shape, gp_Vec(*v)).Shape())
+        return Solid(BRepPrimAPI_MakePrism(self._exact(), gp_Vec(*v)).Shape())
 
+    @_tracked
     def rotate_extrude(self, a=None):
         """Rotate extrude this (2D) solid around the Z axis by the given angle.
         The object will be rotated around the X axis by 90 degrees before being extruded.
@@ -501,8 +1811,9 @@ class Solid:
         """
         args = [] if a is None else [a]
         solid = self.rotateX(np.pi / 2)
-        return Solid(BRepPrimAPI_MakeRevol(solid._shape, gp_OZ(), *args).Shape())
+        return Solid(BRepPrimAPI_MakeRevol(solid._exact(), gp_OZ(), *args).Shape())
 
+    @_tracked
     def spline_extrude(self, points):
         """Spline extrude this (2D) solid along a cubic spline given by 3D points.
         :param points the 3D points to create the cubic spline from 
@@ -514,9 +1825,10 @@ class Solid:
         spline = GeomAPI_PointsToBSpline(data, 3, 3).Curve()
         edge = BRepBuilderAPI_MakeEdge(spline).Edge()
         wire = BRepBuilderAPI_MakeWire(edge).Wire()
-        brep = BRepOffsetAPI_MakePipe(wire, self._shape)
+        brep = BRepOffsetAPI_MakePipe(wire, self._exact())
         return Solid(brep.Shape())
 
+    @_tracked
     def helix_extrude(self, r, h, pitch, center=False):
         """Helix extrude this (2D) solid by the given radius, height and pitch.
         The object will be rotated around the X axis by the slope of the helix
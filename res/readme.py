@@ -106,6 +106,18 @@ The rotate method here is different from the OpenSCAD rotate method.  The first
 
 I also added a new extrude method called spline_extrude.  It takes a list of points as its only argument.  These points are converted into a cubic spline which is then used to extrude a solid.  An example of spline_extrude is the helix_extrude method which creates a helix from a solid.
 
+The boolean and file methods have async variants, like difference_async and write_stl_async, for use
+in asyncio services.  They run on the executor configured with set_executor, a thread pool by default.
+A timeout or cancellation abandons the operation but its slot in the concurrency limit is only freed
+once the operation actually finishes, so runaway operations cannot pile up without bound.
+pythonOCC holds the GIL while OpenCASCADE runs, so with a thread pool a long operation still stalls
+the event loop and its timeout only fires once it returns.  Call set_executor('process') in services
+that must stay responsive while an operation runs away.
+
+Calling set_backend('mesh') makes the boolean methods work on triangle meshes instead, which is much
+faster but only approximate.  Primitives stay exact until they meet in a boolean.  Use it to preview
+a design while iterating, then call set_backend('occ') and rerun the script before writing STEP files.
+
 ## csgstep API
 
 {generate_docs('csgstep')}
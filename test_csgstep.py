@@ -1,6 +1,11 @@
 
 
 import unittest
+import asyncio
+import threading
+import time
+import tracemalloc
+import concurrent.futures
 from csgstep import *
 import numpy as np
 
@@ -107,6 +112,183 @@ class CSGStepTestCase(unittest.TestCase):
     polygon(points).spline_extrude([(0,0,0),(0,1,2),(0,2,3)])
     polygon(points).scale(.1).helix_extrude(r=8, h=5.1, pitch=1)
 
+  def test_async(self):
+    async def build():
+      s = await cube().difference_async(sphere(.65), timeout=60)
+      s = await s.union_async(cube().translateX(1))
+      await s.write_step_async('/tmp/out_async.stp')
+      await s.write_stl_async('/dev/null', mode='binary')
+      return await load_step_async('/tmp/out_async.stp')
+    set_executor('thread', max_workers=2, max_concurrency=2)
+    try:
+      s = asyncio.run(build())
+    finally:
+      set_executor(None)
+    self.assertIsInstance(s, Solid)
+    # executors passed in are left running for their owner
+    with concurrent.futures.ThreadPoolExecutor(1) as pool:
+      set_executor(pool)
+      set_executor(None)
+      self.assertEqual(pool.submit(int, '1').result(), 1)
+
+  def test_async_timeout(self):
+    # the gate stands in for a long operation on the slot bookkeeping,
+    # unlike OpenCASCADE it waits without holding the GIL
+    gate = threading.Event()
+    class GatedExecutor(concurrent.futures.ThreadPoolExecutor):
+      def submit(self, fn, *args, **kwargs):
+        return super().submit(lambda: (gate.wait(), fn(*args, **kwargs))[1])
+    async def run():
+      # the first job keeps running and holds the only slot
+      with self.assertRaises(asyncio.TimeoutError):
+        await cube().difference_async(sphere(), timeout=.1)
+      # waiting for the slot is covered by the timeout too
+      start = time.monotonic()
+      with self.assertRaises(asyncio.TimeoutError):
+        await cube().difference_async(sphere(), timeout=.2)
+      self.assertLess(time.monotonic() - start, 1)
+      task = asyncio.ensure_future(cube().difference_async(sphere()))
+      await asyncio.sleep(.1)
+      task.cancel()
+      with self.assertRaises(asyncio.CancelledError):
+        await task
+      # the slot is freed once the abandoned job finishes
+      gate.set()
+      return await cube().difference_async(sphere(), timeout=60)
+    pool = GatedExecutor(2)
+    set_executor(pool, max_concurrency=1)
+    try:
+      s = asyncio.run(run())
+    finally:
+      gate.set()
+      set_executor(None)
+      pool.shutdown()
+    self.assertIsInstance(s, Solid)
+
+  def test_measure(self):
+    s = cube(s=(1,2,3))
+    self.assertAlmostEqual(s.volume, 6)
+    self.assertAlmostEqual(s.area, 22)
+    np.testing.assert_allclose(s.center_of_mass, (.5,1,1.5))
+    np.testing.assert_allclose(s.bounds, [(0,0,0),(1,2,3)], atol=1e-6)
+    self.assertEqual(s.num_solids, 1)
+    self.assertEqual(s.num_faces, 6)
+    self.assertEqual(s.num_edges, 12)
+    self.assertEqual(s.num_vertices, 8)
+    m = measure_many([cube(), cube(2), sphere()], workers=2)
+    np.testing.assert_allclose(m['volume'], [1, 8, 4 / 3 * np.pi])
+    self.assertEqual(m['center_of_mass'].shape, (3, 3))
+    self.assertEqual(m['bounds'].shape, (3, 2, 3))
+    np.testing.assert_array_equal(m['num_faces'], [6, 6, 1])
+    self.assertEqual(measure_many([])['bounds'].shape, (0, 2, 3))
+
+  def test_query(self):
+    s = cube(center=True)
+    points = np.array([(0,0,0), (.4,.4,.4), (.6,0,0), (3,3,3), (0,0,.5)])
+    np.testing.assert_array_equal(s.contains(points),
+      [True, True, False, False, True])
+    np.testing.assert_array_equal(s.contains(points, workers=2, chunk_size=2),
+      s.contains(points))
+    np.testing.assert_allclose(s.distance(points, workers=2, chunk_size=2),
+      [0, 0, .1, np.sqrt(3 * 2.5**2), 0], atol=1e-6)
+    self.assertEqual(s.contains(np.empty((0, 3))).shape, (0,))
+
+  def test_voxelize(self):
+    v = cube().voxelize(.25)
+    self.assertEqual(v.shape, (4, 4, 4))
+    self.assertTrue(v.all())
+    v = sphere().voxelize(.05, filename='/tmp/out.npy')
+    self.assertAlmostEqual(v.sum() * .05**3, 4 / 3 * np.pi, places=1)
+    np.testing.assert_array_equal(np.load('/tmp/out.npy'), v)
+    d = cube(center=True).sdf(np.array([(0,0,0), (1,0,0)]))
+    np.testing.assert_allclose(d, [-.5, .5], atol=1e-6)
+    self.assertEqual(cube().sdf(.25).shape, (4, 4, 4))
+    s = sphere()
+    d = s.sdf(.2)
+    points = s.bounds[0] + .2 * (np.stack(np.indices(d.shape), axis=-1) + .5)
+    np.testing.assert_allclose(d, s.sdf(points, linear_deflection=.05), atol=.02)
+    tracemalloc.start()
+    try:
+      d = s.sdf(.02, filename='/tmp/sdf.npy')
+      peak = tracemalloc.get_traced_memory()[1]
+    finally:
+      tracemalloc.stop()
+    # neither the distances nor the closest points are held in memory
+    self.assertLess(peak, d.nbytes)
+
+  def test_topology(self):
+    s = cube()
+    t = s.topology
+    self.assertEqual(len(t.faces), 6)
+    self.assertEqual(len(t.edges), 12)
+    self.assertNotIn('edge_length', vars(t))
+    np.testing.assert_allclose(t.edge_length, 1)
+    np.testing.assert_allclose(t.face_area, 1)
+    self.assertEqual(t.edges_parallel((0,0,1)).sum(), 4)
+    self.assertEqual(t.edges_in_box((0,0,0), (1,1,0)).sum(), 4)
+    self.assertEqual(t.faces_perpendicular((0,0,1)).sum(), 4)
+    self.assertEqual(t.faces_normal((0,0,1)).sum(), 1)
+    s.fillet(.1, edges=lambda t: t.edges_parallel((0,0,1)))
+    s.chamfer(.1, edges=[0, 1])
+    s.fillet(.1, edges=t.edges_in_box((0,0,0), (1,1,0)))
+    s.draft(.1)
+    s.draft(.1, faces=lambda t: t.faces_perpendicular((1,0,0)))
+    cube().fillet(.1).chamfer(.05)
+    mask = sphere().topology.edges_parallel((0,0,1))
+    self.assertRaises(ValueError, s.fillet, .1, edges=mask)
+    self.assertRaises(ValueError, s.chamfer, .1, edges=[12])
+    self.assertRaises(ValueError, s.draft, .1, faces=[-1])
+
+  def test_backend(self):
+    exact = (cube(center=True) - sphere(.65)).volume
+    self.assertEqual(set_backend('mesh'), 'occ')
+    try:
+      s = cube(center=True) - sphere(.65)
+      self.assertAlmostEqual(s.volume, exact, delta=.01)
+      s = cube().union(cube().translateX(1))
+      self.assertAlmostEqual(s.volume, 2, places=6)
+      self.assertAlmostEqual(s.area, 10, places=6)
+      s = cube() - cube((.2, 1, .1)).translate((.4, 0, .9))
+      self.assertAlmostEqual(s.volume, .98, delta=.005)
+      s = s.translateX(1).rotateZ(1).mirrorX().scale((1,2,3)).fillet(.1)
+      s = s.union(cube(), sphere()) * cube(2) + sphere()
+      s.contains([(0,0,0)])
+      s.write_stl('/dev/null')
+      s.write_stl('/dev/null', mode='binary')
+      self.assertRaises(ValueError, s.write_step, '/dev/null')
+      square().linear_extrude(2) - circle().linear_extrude(2)
+    finally:
+      set_backend('occ')
+
+  def test_memory(self):
+    set_memory_mode(lean=True, track=True)
+    try:
+      s = cube()
+      for i in range(10):
+        s = s - sphere(.1).translate((i / 10, 0, 1))
+      s = s.union(cube().translateX(1)).fillet(.01)
+      s.write_stl('/dev/null')
+      self.assertGreater(s.memory_size(), 0)
+      report = memory_report(reset=True)
+      self.assertEqual(report['difference']['calls'], 10)
+      self.assertGreater(report['union']['peak_rss'], 0)
+      self.assertGreaterEqual(report['union']['peak_rss'], report['union']['rss'])
+      self.assertEqual(memory_report(), {})
+      s.release()
+    finally:
+      set_memory_mode()
+    s = cube()
+    s.write_stl('/dev/null')
+    size = s.memory_size()
+    set_memory_mode(lean=True)
+    try:
+      s.translateX(1).write_stl('/dev/null')
+    finally:
+      set_memory_mode()
+    self.assertEqual(s.memory_size(), size)
+    s.release()
+    self.assertLess(s.memory_size(), size)
+
 if __name__ == "__main__":
     unittest.main()
 